@@ -1,8 +1,8 @@
-import array
 import wave
 import struct
 import argparse
 import ctypes
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from pydub import AudioSegment
@@ -22,10 +22,10 @@ def read_wav_file(filename):
         # Read all frames
         frames = wav_file.readframes(n_frames)
         
-        # Convert to array of 16-bit integers
+        # Zero-copy view of 16-bit integers over the WAV bytes
         if sample_width == 2:  # 16-bit
             if n_channels == 1:
-                pcm = array.array('h', frames)
+                pcm = np.frombuffer(frames, dtype=np.int16)
             else:
                 raise ValueError("Only mono WAV files are supported")
         else:
@@ -59,20 +59,17 @@ def mono_ch_codec(input_file, output_file):
     
     # Get the frame samples
     frame_samples = encoder.get_frame_samples()
-    
-    # Encode the PCM data frame by frame
-    encoded_frames = b''
+
+    # Pad to the frame boundary once upfront instead of per frame
+    n_pad = -len(pcm_data) % frame_samples
+    if n_pad:
+        pcm_data = np.pad(pcm_data, (0, n_pad), mode="constant")
+
+    # Encode the PCM data frame by frame, accumulating into a bytearray
+    # to avoid re-copying the whole stream on every append
+    encoded_frames = bytearray()
     for i in range(0, len(pcm_data), frame_samples):
-        # Get a frame of PCM data
-        frame_bytes = pcm_data[i:i + frame_samples]
-        
-        # Pad with zeros if needed
-        if len(frame_bytes) < frame_samples:
-            frame_bytes.extend([0] * (frame_samples - len(frame_bytes)))
-        
-        # Encode the frame
-        encoded_frame = encoder.encode(frame_bytes)
-        encoded_frames += encoded_frame
+        encoded_frames.extend(encoder.encode(pcm_data[i:i + frame_samples]))
 
     print(f"Encoded {len(encoded_frames)} frames")
     print(f"Frame size: {encoder.get_frame_size()} bytes")
@@ -89,20 +86,19 @@ def mono_ch_codec(input_file, output_file):
     )
     frame_size = decoder.get_frame_size()
 
-    decoded_frames = b''
+    decoded_frames = bytearray()
 
     # Decode the data frame by frame
     for i in range(frame_size, len(encoded_frames), frame_size):
         # Get a frame of SBC data
         frame_data = encoded_frames[i:i + frame_size]
-        
+
         # Skip incomplete frames
         if len(frame_data) < frame_size:
             break
 
         # Decode the frame
-        decoded_frame = decoder.decode(frame_data)
-        decoded_frames += decoded_frame
+        decoded_frames.extend(decoder.decode(frame_data))
     
     # Get sample rate and channels from the frame parameters
     sample_rate = decoder.get_sample_rate_hz()
@@ -121,62 +117,91 @@ def three_ch_codec(input_file, output_file):
     audio = np.array(audio_segment.get_array_of_samples(), dtype=np.float32).reshape(-1, 3)
     audio = audio.astype(np.int16)
 
-    encoder = [sbc.Encoder(
+    # Channels 0/1 go through a single stereo encoder (one C call covers
+    # both via the interleaved pcml/pcmr pitch=2 path); channel 2 keeps
+    # its own mono codec. Two streams instead of three halve the
+    # per-frame Python overhead for the pair.
+    enc_stereo = sbc.Encoder(
+        nsubbands=8,
+        nblocks=16,
+        frequency=sbc.SBCFreq.FREQ_16K,
+        mode=sbc.SBCMode.STEREO,
+        bitpool=32,
+    )
+    enc_mono = sbc.Encoder(
         nsubbands=8,
         nblocks=16,
         frequency=sbc.SBCFreq.FREQ_16K,
         mode=sbc.SBCMode.MONO,
         bitpool=32,
-    ) for _ in range(n_channels)]
+    )
 
-    decoder = [sbc.Decoder(
+    dec_stereo = sbc.Decoder(
+        nsubbands=8,
+        nblocks=16,
+        frequency=sbc.SBCFreq.FREQ_16K,
+        mode=sbc.SBCMode.STEREO
+    )
+    dec_mono = sbc.Decoder(
         nsubbands=8,
         nblocks=16,
         frequency=sbc.SBCFreq.FREQ_16K,
         mode=sbc.SBCMode.MONO
-    ) for _ in range(n_channels)]
+    )
 
-    frame_samples = encoder[0].get_frame_samples()
-    frame_size = encoder[0].get_frame_size()
-    print(f"Frame size: {frame_size} bytes")
+    frame_samples = enc_mono.get_frame_samples()
+    stereo_frame_size = enc_stereo.get_frame_size()
+    mono_frame_size = enc_mono.get_frame_size()
+    print(f"Frame size: {stereo_frame_size} (stereo) / {mono_frame_size} (mono) bytes")
     print(f"Frame samples: {frame_samples} samples")
 
-    # pad audio to be divisible by frame_samples
-    if audio.shape[0] % frame_samples != 0:
-        len_frame = audio.shape[0] % frame_samples
-        print(f"Padding {frame_samples - len_frame} samples")
-        audio = np.pad(audio, ((0, frame_samples - len_frame), (0, 0)), mode="constant")
-
-    # pad one additional frame to the end of audio
+    # pad audio to the next frame boundary, plus one additional frame at
+    # the end, in a single copy
     print(f"Audio shape: {audio.shape}")
-    audio = np.pad(audio, ((0, frame_samples), (0, 0)), mode="constant")
+    tail = -audio.shape[0] % frame_samples
+    if tail:
+        print(f"Padding {tail} samples")
+    audio = np.pad(audio, ((0, tail + frame_samples), (0, 0)), mode="constant")
     print(f"Audio shape: {audio.shape}")
 
-    # SBC encoding by frame_samples
-    encoded = [b'' for _ in range(n_channels)]
-    for i in range(n_channels):
-        # loop through each frame size in audio.shape[0]
-        for j in range(0, audio.shape[0], frame_samples):
-            frame = audio[j:j + frame_samples, i]
-            encoded[i] += encoder[i].encode(frame.tolist())
-        print(f"Encoded {len(encoded[i])} frames.")
-
-    # Write the encoded data to a file
+    # AoSoA frame feed: one contiguous (n_frames, inner) block per
+    # stream, with the frame as the inner dimension — interleaved
+    # [L, R, L, R, ...] frames for the stereo pair (the layout the
+    # pcml/pcmr pitch=2 path consumes directly) and planar frames for
+    # the mono channel. Each encoder streams linearly through its own
+    # block, every row is a zero-copy contiguous frame view, and the
+    # inner loops do no slicing arithmetic. Frames are joined once, so
+    # the accumulator never gets re-copied as it grows.
+    pair_frames = np.ascontiguousarray(audio[:, :2]).reshape(-1, frame_samples * 2)
+    mono_frames = np.ascontiguousarray(audio[:, 2]).reshape(-1, frame_samples)
+
+    # The two streams have independent codec state and can be processed
+    # in parallel.
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        encoded = [w.result() for w in (ex.submit(enc_stereo.encode_batch, pair_frames),
+                                        ex.submit(enc_mono.encode_batch, mono_frames))]
+    for data in encoded:
+        print(f"Encoded {len(data)} frames.")
+
+    # Write the encoded data to a file in one write call
     with open(output_file.replace(".wav", ".sbc"), 'wb') as f:
-        for i in range(n_channels):
-            f.write(encoded[i])
-
-    # SBC decoding by frame_size
-    decoded = [b'' for _ in range(n_channels)]
-    for i in range(n_channels):
-        # loop through each frame size in mixed.shape[0]
-        for j in range(0, len(encoded[i]), frame_size):
-            encoded_frame = encoded[i][j:j + frame_size]
-            decoded[i] += decoder[i].decode(encoded_frame)
-
-        print(f"Decoded {len(decoded[i])} frames.")
-
-    decoded_np = np.array([np.frombuffer(decoded[i], dtype=np.int16) for i in range(n_channels)]).T
+        f.write(b''.join(encoded))
+
+    # SBC decoding by frame_size, one worker per stream
+    def decode_stream(decoder, data, frame_size):
+        return b''.join(decoder.decode(data[j:j + frame_size])
+                        for j in range(0, len(data), frame_size))
+
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        decoded = [w.result() for w in (
+            ex.submit(decode_stream, dec_stereo, encoded[0], stereo_frame_size),
+            ex.submit(decode_stream, dec_mono, encoded[1], mono_frame_size))]
+    for data in decoded:
+        print(f"Decoded {len(data)} frames.")
+
+    pair_np = np.frombuffer(decoded[0], dtype=np.int16).reshape(-1, 2)
+    mono_np = np.frombuffer(decoded[1], dtype=np.int16)
+    decoded_np = np.column_stack([pair_np, mono_np])
     print(f"Decoded shape: {decoded_np.shape}")
     # remove the first 73 samples (SBC delay) of audio at the beginning
     decoded_np = decoded_np[73:]
@@ -209,6 +209,21 @@ int sbc_encode(sbc_t *sbc,
     const int16_t *pcml, int pitchl, const int16_t *pcmr, int pitchr,
     const struct sbc_frame *frame, void *data, unsigned size);
 
+/**
+ * Encode a sequence of frames
+ * sbc             Encoding context
+ * pcm             Input PCM buffer of `nframes` consecutive frames,
+ *                 interleaved when `pitch` is 2
+ * pitch           Number of samples between two consecutives
+ * nframes         Number of frames to encode
+ * frame           Frame description as encoding parameters
+ * data, size      Output frames data, and maximum writable size
+ * return          0 on success, -1 otherwise
+ */
+int sbc_encode_batch(sbc_t *sbc,
+    const int16_t *pcm, int pitch, unsigned nframes,
+    const struct sbc_frame *frame, void *data, unsigned size);
+
 
 #ifdef __cplusplus
 }
@@ -5,11 +5,17 @@ import glob
 import os
 import platform
 import sys
+import threading
 from pathlib import Path
 
-from ctypes import c_bool, c_byte, c_int, c_uint, c_size_t, c_void_p, c_int16
+from ctypes import c_bool, c_byte, c_int, c_uint, c_void_p, c_int16
 from ctypes.util import find_library
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class SBCFreq(enum.IntEnum):
     """SBC sampling frequency"""
@@ -33,6 +39,163 @@ class SBCBAM(enum.IntEnum):
     SNR = 1  # Signal-to-noise ratio
 
 
+# SBC_MAX_BLOCKS * SBC_MAX_SUBBANDS from sbc.h
+_SBC_MAX_SAMPLES = 128
+
+
+class _SBCFrame(ctypes.Structure):
+    """SBC frame description (struct sbc_frame)"""
+    _fields_ = [
+        ("msbc", c_bool),
+        ("freq", c_int),
+        ("mode", c_int),
+        ("bam", c_int),
+        ("nblocks", c_int),
+        ("nsubbands", c_int),
+        ("bitpool", c_int)
+    ]
+
+
+class _SBC(ctypes.Structure):
+    """SBC codec context (struct sbc)"""
+    _fields_ = [
+        ("nchannels", c_int),
+        ("nblocks", c_int),
+        ("nsubbands", c_int),
+        ("_states", c_byte * 700)
+    ]
+
+
+# Process-wide cache of loaded libraries, keyed by requested path:
+# dlopen and the one-shot prototype setup only happen once per library,
+# no matter how many Encoder/Decoder instances are built
+_lib_cache = {}
+_lib_lock = threading.Lock()
+
+
+def _load_library(libpath=None):
+    """
+    Load the SBC library, prioritizing:
+    1. User-provided explicit path
+    2. Library packaged with this module
+    3. System-installed library
+
+    The library is loaded with ctypes.CDLL, which releases the GIL
+    for the duration of each foreign call, so sbc_encode/sbc_decode
+    from different instances can run concurrently across threads.
+    """
+    if libpath is not None:
+        return ctypes.cdll.LoadLibrary(libpath)
+
+    # Try to load from package directory first
+    package_dir = Path(__file__).parent.absolute()
+    system = platform.system()
+
+    if system == 'Linux':
+        lib_name = 'libsbc.so'
+    elif system == 'Darwin':
+        lib_name = 'libsbc.dylib'
+    elif system == 'Windows':
+        lib_name = 'libsbc.dll'
+    else:
+        lib_name = 'libsbc.so'  # Default to Linux naming
+
+    packaged_lib = package_dir / lib_name
+    if packaged_lib.exists():
+        try:
+            return ctypes.cdll.LoadLibrary(str(packaged_lib))
+        except OSError:
+            pass  # Fall back to other methods
+
+    # Try to find in system paths
+    system_lib = find_library("sbc")
+    if system_lib:
+        return ctypes.cdll.LoadLibrary(system_lib)
+
+    # Final fallback: search common directories
+    common_dirs = [
+        '/usr/lib',
+        '/usr/local/lib',
+        '/opt/local/lib',
+    ]
+
+    for d in common_dirs:
+        pattern = os.path.join(d, f'*{lib_name}*')
+        matches = glob.glob(pattern)
+        if matches:
+            return ctypes.cdll.LoadLibrary(matches[0])
+
+    # If we got here, we couldn't find the library
+    raise Exception(f"SBC library ({lib_name}) not found. Please install it or specify the path using libpath.")
+
+
+def _configure_prototypes(lib):
+    """Set up the ctypes prototypes of a freshly loaded SBC library."""
+    lib.sbc_get_freq_hz.argtypes = [c_int]
+    lib.sbc_get_freq_hz.restype = c_int
+
+    lib.sbc_get_frame_size.argtypes = [ctypes.POINTER(_SBCFrame)]
+    lib.sbc_get_frame_size.restype = c_uint
+
+    lib.sbc_get_frame_bitrate.argtypes = [ctypes.POINTER(_SBCFrame)]
+    lib.sbc_get_frame_bitrate.restype = c_uint
+
+    lib.sbc_reset.argtypes = [ctypes.POINTER(_SBC)]
+
+    lib.sbc_probe.argtypes = [c_void_p, ctypes.POINTER(_SBCFrame)]
+    lib.sbc_probe.restype = c_int
+
+    lib.sbc_encode.argtypes = [
+        ctypes.POINTER(_SBC),
+        ctypes.POINTER(c_int16),  # pcml
+        c_int,                     # pitchl
+        ctypes.POINTER(c_int16),  # pcmr
+        c_int,                     # pitchr
+        ctypes.POINTER(_SBCFrame),
+        c_void_p,                  # data
+        c_uint                     # size
+    ]
+    lib.sbc_encode.restype = c_int
+
+    lib.sbc_decode.argtypes = [
+        ctypes.POINTER(_SBC),
+        c_void_p,                  # data
+        c_uint,                    # size
+        ctypes.POINTER(_SBCFrame),
+        ctypes.POINTER(c_int16),  # pcml
+        c_int,                     # pitchl
+        ctypes.POINTER(c_int16),  # pcmr
+        c_int                      # pitchr
+    ]
+    lib.sbc_decode.restype = c_int
+
+    # sbc_encode_batch may be missing from an older system library
+    try:
+        lib.sbc_encode_batch.argtypes = [
+            ctypes.POINTER(_SBC),
+            ctypes.POINTER(c_int16),  # pcm
+            c_int,                     # pitch
+            c_uint,                    # nframes
+            ctypes.POINTER(_SBCFrame),
+            c_void_p,                  # data
+            c_uint                     # size
+        ]
+        lib.sbc_encode_batch.restype = c_int
+    except AttributeError:
+        pass
+
+
+def _get_lib(libpath=None):
+    """Return the process-wide SBC library handle, loading it on first use."""
+    with _lib_lock:
+        lib = _lib_cache.get(libpath)
+        if lib is None:
+            lib = _load_library(libpath)
+            _configure_prototypes(lib)
+            _lib_cache[libpath] = lib
+        return lib
+
+
 class _Base:
     """Base class for SBC encoder and decoder"""
 
@@ -87,33 +250,12 @@ class _Base:
         if not isinstance(bam, SBCBAM):
             raise ValueError("Invalid bit allocation method")
         
-        # Load the SBC library
-        self.lib = self._load_library(libpath)
-        
-        # Get C standard library for memory allocation
-        libc = ctypes.cdll.LoadLibrary(find_library("c"))
-        
-        self.malloc = libc.malloc
-        self.malloc.argtypes = [c_size_t]
-        self.malloc.restype = c_void_p
-        
-        self.free = libc.free
-        self.free.argtypes = [c_void_p]
-        
-        # Define SBC frame struct
-        class SBCFrame(ctypes.Structure):
-            _fields_ = [
-                ("msbc", c_bool),
-                ("freq", c_int),
-                ("mode", c_int),
-                ("bam", c_int),
-                ("nblocks", c_int),
-                ("nsubbands", c_int),
-                ("bitpool", c_int)
-            ]
-        
-        self.SBCFrame = SBCFrame
-        self.frame = SBCFrame(
+        # Load the SBC library (cached process-wide, prototypes are
+        # configured once at first load)
+        self.lib = _get_lib(libpath)
+
+        self.SBCFrame = _SBCFrame
+        self.frame = _SBCFrame(
             msbc=self.msbc,
             freq=self.freq,
             mode=self.mode,
@@ -122,86 +264,46 @@ class _Base:
             nsubbands=self.nsubbands,
             bitpool=self.bitpool
         )
-        
-        # Set up function prototypes
-        self.lib.sbc_get_freq_hz.argtypes = [c_int]
-        self.lib.sbc_get_freq_hz.restype = c_int
-        
-        self.lib.sbc_get_frame_size.argtypes = [ctypes.POINTER(SBCFrame)]
-        self.lib.sbc_get_frame_size.restype = c_uint
-        
-        self.lib.sbc_get_frame_bitrate.argtypes = [ctypes.POINTER(SBCFrame)]
-        self.lib.sbc_get_frame_bitrate.restype = c_uint
-    
-    def _load_library(self, libpath=None):
-        """
-        Load the SBC library, prioritizing:
-        1. User-provided explicit path
-        2. Library packaged with this module
-        3. System-installed library
-        """
-        if libpath is not None:
-            return ctypes.cdll.LoadLibrary(libpath)
-        
-        # Try to load from package directory first
-        package_dir = Path(__file__).parent.absolute()
-        system = platform.system()
-        
-        if system == 'Linux':
-            lib_name = 'libsbc.so'
-        elif system == 'Darwin':
-            lib_name = 'libsbc.dylib'
-        elif system == 'Windows':
-            lib_name = 'libsbc.dll'
-        else:
-            lib_name = 'libsbc.so'  # Default to Linux naming
-        
-        packaged_lib = package_dir / lib_name
-        if packaged_lib.exists():
-            try:
-                return ctypes.cdll.LoadLibrary(str(packaged_lib))
-            except OSError:
-                pass  # Fall back to other methods
-        
-        # Try to find in system paths
-        system_lib = find_library("sbc")
-        if system_lib:
-            return ctypes.cdll.LoadLibrary(system_lib)
-        
-        # Final fallback: search common directories
-        common_dirs = [
-            '/usr/lib',
-            '/usr/local/lib',
-            '/opt/local/lib',
-        ]
-        
-        for d in common_dirs:
-            pattern = os.path.join(d, f'*{lib_name}*')
-            matches = glob.glob(pattern)
-            if matches:
-                return ctypes.cdll.LoadLibrary(matches[0])
-        
-        # If we got here, we couldn't find the library
-        raise Exception(f"SBC library ({lib_name}) not found. Please install it or specify the path using libpath.")
-    
-    def get_frame_size(self):
-        """
-        Returns the size of an SBC frame in bytes.
-        """
+
+        # Cache the frame geometry: the parameters are fixed after
+        # construction, so the ctypes round-trips only need to happen once
+        # (the decoder refreshes these if a probed stream changes them)
+        self._frame_samples = self.nblocks * self.nsubbands
+        self._frame_size = self._query_frame_size()
+        self._frame_bitrate = self._query_frame_bitrate()
+
+        # Scratch buffers reused across encode/decode calls. Sized for the
+        # worst case (stereo PCM at the maximum SBC frame configuration)
+        # so they stay valid even if a decoded stream changes parameters.
+        self._pcm_scratch = (c_int16 * (_SBC_MAX_SAMPLES * 2))()
+        self._data_scratch = (c_byte * max(self._frame_size, 512))()
+
+    def _query_frame_size(self):
+        """Ask the C library for the frame size of the current parameters."""
         ret = self.lib.sbc_get_frame_size(ctypes.byref(self.frame))
         if ret == 0:
             raise ValueError("Bad parameters")
         return ret
-    
-    def get_frame_bitrate(self):
-        """
-        Returns the bitrate of the SBC frame in bits per second.
-        """
+
+    def _query_frame_bitrate(self):
+        """Ask the C library for the bitrate of the current parameters."""
         ret = self.lib.sbc_get_frame_bitrate(ctypes.byref(self.frame))
         if ret == 0:
             raise ValueError("Bad parameters")
         return ret
-    
+
+    def get_frame_size(self):
+        """
+        Returns the size of an SBC frame in bytes.
+        """
+        return self._frame_size
+
+    def get_frame_bitrate(self):
+        """
+        Returns the bitrate of the SBC frame in bits per second.
+        """
+        return self._frame_bitrate
+
     def get_sample_rate_hz(self):
         """
         Returns the sample rate in Hz based on the frequency enum.
@@ -215,7 +317,7 @@ class _Base:
         """
         Returns the number of PCM samples in an SBC frame.
         """
-        return self.nblocks * self.nsubbands
+        return self._frame_samples
 
 
 class Encoder(_Base):
@@ -237,75 +339,70 @@ class Encoder(_Base):
     
     def __init__(self, nsubbands, nblocks, frequency, mode=SBCMode.MONO, bam=SBCBAM.LOUDNESS, **kwargs):
         super().__init__(nsubbands, nblocks, frequency, mode, bam, **kwargs)
-        
-        # Define SBC struct
-        class SBC(ctypes.Structure):
-            _fields_ = [
-                ("nchannels", c_int),
-                ("nblocks", c_int),
-                ("nsubbands", c_int),
-                ("_estates", c_byte * 700) 
-            ]
-        
-        self.SBC = SBC
-        
-        # Set up encoder function prototypes
-        self.lib.sbc_reset.argtypes = [ctypes.POINTER(SBC)]
-        
-        self.lib.sbc_encode.argtypes = [
-            ctypes.POINTER(SBC),
-            ctypes.POINTER(c_int16),  # pcml
-            c_int,                     # pitchl
-            ctypes.POINTER(c_int16),  # pcmr
-            c_int,                     # pitchr
-            ctypes.POINTER(self.SBCFrame),
-            c_void_p,                  # data
-            c_uint                     # size
-        ]
-        self.lib.sbc_encode.restype = c_int
-        
+
+        self.SBC = _SBC
+
         # Initialize the SBC context
         nchannels = 1
         if self.mode != SBCMode.MONO:
             nchannels = 2
-            
-        self.sbc = SBC(
+
+        self.sbc = _SBC(
             nchannels=nchannels,
             nblocks=self.nblocks,
             nsubbands=self.nsubbands
         )
-        
+
         self.lib.sbc_reset(ctypes.byref(self.sbc))
-    
+
+        # Prebound function and argument handles: skips the lib attribute
+        # lookup and byref construction on every encode call
+        self._encode_fn = self.lib.sbc_encode
+        self._sbc_ref = ctypes.byref(self.sbc)
+        self._frame_ref = ctypes.byref(self.frame)
+
+        # sbc_encode_batch may be missing from an older system library;
+        # encode_batch falls back to a Python loop in that case
+        self._encode_batch_fn = getattr(self.lib, 'sbc_encode_batch', None)
+
     def encode(self, pcm):
         """
         Encode PCM samples to SBC frame.
-        
+
         Args:
-            pcm: Input PCM data as a list or array of 16-bit integers.
+            pcm: Input PCM data as a list or array of 16-bit integers,
+                 or a contiguous NumPy int16 array.
                  For stereo, samples should be interleaved [L, R, L, R, ...].
-        
+
         Returns:
             Encoded SBC frame as bytes.
         """
         frame_samples = self.get_frame_samples()
-        
+
         # Determine if we have mono or stereo
         is_stereo = (self.mode != SBCMode.MONO)
-        
-        # Convert input to ctypes array
-        pcm_buffer = (c_int16 * len(pcm))(*pcm)
-        
-        # Allocate buffer for encoded data
+
+        # Contiguous NumPy int16 arrays are passed by pointer, avoiding the
+        # per-sample marshalling cost; other inputs are copied into the
+        # reusable PCM scratch buffer.
+        if (np is not None and isinstance(pcm, np.ndarray)
+                and pcm.dtype == np.int16 and pcm.flags['C_CONTIGUOUS']):
+            pcm_buffer = pcm.ctypes.data_as(ctypes.POINTER(c_int16))
+        else:
+            self._pcm_scratch[:len(pcm)] = pcm
+            pcm_buffer = self._pcm_scratch
+
+        # Reuse the preallocated output buffer
         frame_size = self.get_frame_size()
-        data_buffer = (c_byte * frame_size)()
-        
+        data_buffer = self._data_scratch
+
         # Set up PCM pointers for left and right channels
         if is_stereo:
             # For stereo, we pass pcml, pitchl=2, pcmr=pcml+1, pitchr=2
             pcml = pcm_buffer
             pitchl = 2
-            pcmr = ctypes.cast(ctypes.addressof(pcm_buffer) + ctypes.sizeof(c_int16), 
+            base_addr = ctypes.cast(pcm_buffer, c_void_p).value
+            pcmr = ctypes.cast(base_addr + ctypes.sizeof(c_int16),
                               ctypes.POINTER(c_int16))
             pitchr = 2
         else:
@@ -314,20 +411,110 @@ class Encoder(_Base):
             pitchl = 1
             pcmr = None
             pitchr = 0
-        
+
         # Call the encode function
-        ret = self.lib.sbc_encode(
-            ctypes.byref(self.sbc),
+        ret = self._encode_fn(
+            self._sbc_ref,
             pcml, pitchl,
             pcmr, pitchr,
-            ctypes.byref(self.frame),
+            self._frame_ref,
             data_buffer, frame_size
         )
         
         if ret < 0:
             raise ValueError("SBC encoding failed")
-        
-        return bytes(data_buffer)
+
+        return ctypes.string_at(data_buffer, frame_size)
+
+    def encode_planar(self, pcm):
+        """
+        Encode one frame of planar PCM samples to an SBC frame.
+
+        Fast path for NumPy callers: the samples are passed to the C
+        encoder by pointer, with no per-sample conversion.
+
+        Args:
+            pcm: Contiguous NumPy int16 array of exactly frame_samples
+                 samples for one channel (mono mode only).
+
+        Returns:
+            Encoded SBC frame as bytes.
+        """
+        if np is None:
+            raise RuntimeError("encode_planar requires NumPy")
+
+        if self.mode != SBCMode.MONO:
+            raise ValueError("encode_planar only supports mono encoders")
+
+        if (not isinstance(pcm, np.ndarray) or pcm.dtype != np.int16
+                or not pcm.flags['C_CONTIGUOUS']):
+            pcm = np.ascontiguousarray(pcm, dtype=np.int16)
+
+        if pcm.size != self.get_frame_samples():
+            raise ValueError("PCM input must be exactly frame_samples samples")
+
+        frame_size = self.get_frame_size()
+        data_buffer = self._data_scratch
+
+        ret = self._encode_fn(
+            self._sbc_ref,
+            pcm.ctypes.data_as(ctypes.POINTER(c_int16)), 1,
+            None, 0,
+            self._frame_ref,
+            data_buffer, frame_size
+        )
+
+        if ret < 0:
+            raise ValueError("SBC encoding failed")
+
+        return ctypes.string_at(data_buffer, frame_size)
+
+    def encode_batch(self, pcm):
+        """
+        Encode a whole batch of frames in one C call.
+
+        Args:
+            pcm: Contiguous NumPy int16 array of shape (nframes,
+                 frame_samples), or (nframes, 2 * frame_samples) with
+                 interleaved [L, R, L, R, ...] rows for stereo.
+
+        Returns:
+            The concatenated encoded SBC frames as bytes.
+        """
+        if np is None:
+            raise RuntimeError("encode_batch requires NumPy")
+
+        if (not isinstance(pcm, np.ndarray) or pcm.dtype != np.int16
+                or not pcm.flags['C_CONTIGUOUS']):
+            pcm = np.ascontiguousarray(pcm, dtype=np.int16)
+
+        is_stereo = (self.mode != SBCMode.MONO)
+        pitch = 2 if is_stereo else 1
+
+        frame_samples = self.get_frame_samples()
+        if pcm.ndim != 2 or pcm.shape[1] != frame_samples * pitch:
+            raise ValueError("PCM input must be (nframes, %d)"
+                             % (frame_samples * pitch))
+
+        nframes = pcm.shape[0]
+        frame_size = self.get_frame_size()
+        out_size = nframes * frame_size
+        out_buffer = ctypes.create_string_buffer(out_size)
+
+        if self._encode_batch_fn is not None:
+            ret = self._encode_batch_fn(
+                self._sbc_ref,
+                pcm.ctypes.data_as(ctypes.POINTER(c_int16)),
+                pitch, nframes,
+                self._frame_ref,
+                out_buffer, out_size
+            )
+            if ret < 0:
+                raise ValueError("SBC encoding failed")
+            return out_buffer.raw
+
+        # Fallback: loop over the rows through the single-frame path
+        return b''.join(self.encode(frame) for frame in pcm)
 
 
 class Decoder(_Base):
@@ -348,49 +535,37 @@ class Decoder(_Base):
     
     def __init__(self, nsubbands, nblocks, frequency, mode=SBCMode.MONO, bam=SBCBAM.LOUDNESS, **kwargs):
         super().__init__(nsubbands, nblocks, frequency, mode, bam, **kwargs)
-        
-        # Define SBC struct
-        class SBC(ctypes.Structure):
-            _fields_ = [
-                ("nchannels", c_int),
-                ("nblocks", c_int),
-                ("nsubbands", c_int),
-                ("_dstates", c_byte * 700)  
-            ]
-        
-        self.SBC = SBC
-        
-        # Set up decoder function prototypes
-        self.lib.sbc_reset.argtypes = [ctypes.POINTER(SBC)]
-        
-        self.lib.sbc_probe.argtypes = [c_void_p, ctypes.POINTER(self.SBCFrame)]
-        self.lib.sbc_probe.restype = c_int
-        
-        self.lib.sbc_decode.argtypes = [
-            ctypes.POINTER(SBC),
-            c_void_p,                  # data
-            c_uint,                    # size
-            ctypes.POINTER(self.SBCFrame),
-            ctypes.POINTER(c_int16),  # pcml
-            c_int,                     # pitchl
-            ctypes.POINTER(c_int16),  # pcmr
-            c_int                      # pitchr
-        ]
-        self.lib.sbc_decode.restype = c_int
-        
+
+        self.SBC = _SBC
+
         # Initialize the SBC context
         nchannels = 1
         if self.mode != SBCMode.MONO:
             nchannels = 2
-            
-        self.sbc = SBC(
+
+        self.sbc = _SBC(
             nchannels=nchannels,
             nblocks=self.nblocks,
             nsubbands=self.nsubbands
         )
-        
+
         self.lib.sbc_reset(ctypes.byref(self.sbc))
-    
+
+        # Prebound function and argument handles, as in Encoder. The frame
+        # reference is not prebound because probing can replace self.frame.
+        self._decode_fn = self.lib.sbc_decode
+        self._probe_fn = self.lib.sbc_probe
+        self._sbc_ref = ctypes.byref(self.sbc)
+
+        # Header of the last probed frame: frames with an identical header
+        # share its parameters, so re-probing them would be redundant
+        self._last_header = None
+
+        # Reusable probe target: building an SBCFrame walks _fields_ and
+        # allocates, so keep one and zero it before each probe instead
+        self._probe_frame = self.SBCFrame()
+        self._probe_frame_ref = ctypes.byref(self._probe_frame)
+
     def decode(self, data):
         """
         Decode SBC frame to PCM samples.
@@ -406,33 +581,60 @@ class Decoder(_Base):
         if len(data) < 4:  # SBC_HEADER_SIZE
             raise ValueError("Input data too small")
         
-        # Probe the data to verify it's a valid SBC frame
-        data_buffer = (c_byte * len(data)).from_buffer_copy(data)
-        temp_frame = self.SBCFrame()
-        
-        ret = self.lib.sbc_probe(data_buffer, ctypes.byref(temp_frame))
-        if ret < 0:
-            raise ValueError("Invalid SBC frame")
-        
-        # Update our frame parameters based on what we found in the data
-        self.frame = temp_frame
-        
+        # sbc_probe and sbc_decode only read the input, so pass the
+        # caller's buffer directly instead of copying it: bytes through
+        # c_char_p, bytearray through from_buffer, anything else through
+        # the reusable data scratch buffer (grown if the caller hands us
+        # more than one frame's worth of data)
+        if isinstance(data, bytes):
+            data_buffer = ctypes.c_char_p(data)
+        elif isinstance(data, bytearray):
+            data_buffer = (ctypes.c_char * len(data)).from_buffer(data)
+        else:
+            if len(data) > len(self._data_scratch):
+                self._data_scratch = (c_byte * len(data))()
+            ctypes.memmove(self._data_scratch, bytes(data), len(data))
+            data_buffer = self._data_scratch
+
+        # Probe the data to verify it's a valid SBC frame. sbc_probe only
+        # parses the syncword, parameter and bitpool bytes (the fourth
+        # header byte is the per-frame CRC, which sbc_decode checks), so
+        # frames matching the previous one on those bytes carry the same
+        # parameters and the probe (and frame/cache refresh) is skipped.
+        header = bytes(data[:3])
+        if header != self._last_header:
+            ctypes.memset(self._probe_frame_ref, 0, ctypes.sizeof(self.SBCFrame))
+
+            ret = self._probe_fn(data_buffer, self._probe_frame_ref)
+            if ret < 0:
+                raise ValueError("Invalid SBC frame")
+
+            # Update our frame parameters based on what we found in the
+            # data, refreshing the cached frame geometry to match. The
+            # probe result is copied into self.frame so a later failed
+            # probe cannot clobber the live parameters.
+            ctypes.memmove(ctypes.byref(self.frame), self._probe_frame_ref,
+                           ctypes.sizeof(self.SBCFrame))
+            self._frame_samples = self.frame.nblocks * self.frame.nsubbands
+            self._frame_size = self._query_frame_size()
+            self._frame_bitrate = self._query_frame_bitrate()
+            self._last_header = header
+
         # Determine if we have mono or stereo
         is_stereo = (self.frame.mode != SBCMode.MONO)
         
         # Calculate number of PCM samples to output
-        frame_samples = self.frame.nblocks * self.frame.nsubbands
-        total_samples = frame_samples * (2 if is_stereo else 1)
-        
-        # Allocate buffer for decoded PCM
-        pcm_buffer = (c_int16 * total_samples)()
+        total_samples = self._frame_samples * (2 if is_stereo else 1)
         
+        # Reuse the preallocated PCM scratch buffer for the decoded output
+        pcm_buffer = self._pcm_scratch
+
         # Set up PCM pointers for left and right channels
         if is_stereo:
             # For stereo, we pass pcml, pitchl=2, pcmr=pcml+1, pitchr=2
             pcml = pcm_buffer
             pitchl = 2
-            pcmr = ctypes.cast(ctypes.addressof(pcm_buffer) + ctypes.sizeof(c_int16), 
+            pcmr = ctypes.cast(ctypes.addressof(pcm_buffer) + ctypes.sizeof(c_int16),
                               ctypes.POINTER(c_int16))
             pitchr = 2
         else:
@@ -443,8 +645,8 @@ class Decoder(_Base):
             pitchr = 0
         
         # Call the decode function
-        ret = self.lib.sbc_decode(
-            ctypes.byref(self.sbc),
+        ret = self._decode_fn(
+            self._sbc_ref,
             data_buffer, len(data),
             ctypes.byref(self.frame),
             pcml, pitchl,
@@ -453,9 +655,9 @@ class Decoder(_Base):
         
         if ret < 0:
             raise ValueError("SBC decoding failed")
-        
-        # Convert to Python array
-        return bytes(pcm_buffer)
+
+        # Convert to Python bytes
+        return ctypes.string_at(pcm_buffer, total_samples * ctypes.sizeof(c_int16))
 
 
 # Convenience function to get a sample rate in Hz from a frequency enum
@@ -1,53 +1,211 @@
 import os
-import subprocess
 import sys
-from setuptools import setup, find_packages
+from setuptools import setup
+from setuptools.command.build_clib import build_clib
 from setuptools.command.build_py import build_py
-from setuptools.command.install import install
+from setuptools.dist import Distribution
+
+
+# Platform-specific name of the built shared library
+_LIB_NAME = {'darwin': 'libsbc.dylib', 'win32': 'libsbc.dll'}.get(
+    sys.platform, 'libsbc.so')
+
+
+def _build_jobs(override=None):
+    """
+    Return the number of parallel make jobs: an explicit override (from
+    setuptools' build_ext --parallel plumbing) wins, then the
+    SBC_BUILD_JOBS environment variable, then the CPU count. A bare
+    `make -j` spawns unbounded jobs, which oversubscribes memory on
+    many-core hosts and can OOM CI containers.
+    """
+    if isinstance(override, int) and override > 0:
+        return override
+    return int(os.environ.get('SBC_BUILD_JOBS') or os.cpu_count() or 2)
+
+
+def _run_make(*targets, jobs=None):
+    """
+    Invoke make on the given targets with capped parallelism and, when
+    available, the compiler wrapped in ccache so repeat installs serve
+    unchanged translation units from cache. Parallelism is passed
+    through MAKEFLAGS rather than a command-line -j so any recursive
+    sub-make shares the one jobserver instead of multiplying jobs; the
+    compiler override goes on the command line because the Makefile
+    assigns CC with ':=', which ignores the environment. Set CCACHE_DIR
+    to persist the compilation cache across CI runs.
+    """
+    import shutil
+    import subprocess
+
+    env = os.environ.copy()
+    if '-j' not in env.get('MAKEFLAGS', ''):
+        env['MAKEFLAGS'] = ' '.join(
+            filter(None, [env.get('MAKEFLAGS'), f'-j{_build_jobs(jobs)}']))
+
+    cmd = ['make']
+    cc = env.get('CC', 'gcc')
+    if shutil.which('ccache') and 'ccache' not in cc:
+        cmd.append(f'CC=ccache {cc}')
+        # Hash compiler content, not mtime, so cache survives reinstalls
+        env.setdefault('CCACHE_COMPILERCHECK', 'content')
+    cmd.extend(targets)
+
+    # Flush our own output first so it interleaves correctly with the
+    # child's in buffered CI logs
+    sys.stdout.flush()
+    subprocess.run(cmd, env=env, check=True)
+
+
+def _source_hash():
+    """
+    Content hash of the native sources, headers and makefiles. Hashing
+    content rather than mtimes keeps the up-to-date check stable across
+    git checkouts and editor touches, which invalidate mtimes without
+    changing anything.
+    """
+    import hashlib
+
+    paths = ['Makefile', 'makefile.mk']
+    for root in ('src', 'include'):
+        for dirpath, _, filenames in os.walk(root):
+            paths.extend(os.path.join(dirpath, f) for f in filenames
+                         if f.endswith(('.c', '.h', '.s')))
+
+    h = hashlib.blake2b(digest_size=16)
+    for p in sorted(paths):
+        try:
+            with open(p, 'rb') as f:
+                content = f.read()
+        except OSError:
+            continue
+        h.update(p.encode())
+        h.update(content)
+    return h.hexdigest()
+
+
+def _needs_rebuild(lib_path, src_hash):
+    """Whether the library is missing or its source stamp is stale."""
+    try:
+        os.stat(lib_path)
+        with open(lib_path + '.stamp') as f:
+            return f.read() != src_hash
+    except OSError:
+        return True
+
+
+# One pip run can invoke several build commands (sdist, wheel, install),
+# each of which used to trigger a full native rebuild; build at most once
+# per process on top of the on-disk up-to-date check
+_native_built = False
+
+
+def _build_native_library(jobs=None):
+    """Run make and stage the shared library into the package, once."""
+    global _native_built
+    if _native_built:
+        return
+
+    # Imported here so pip metadata-only invocations of setup.py
+    # (--name, --version, dependency resolution) don't pay for them
+    import shutil
+    import subprocess
+
+    lib_path = os.path.join('bin', _LIB_NAME)
+
+    # Build the native library, unless the sources feeding it are
+    # unchanged since the stamped build
+    src_hash = _source_hash()
+    if _needs_rebuild(lib_path, src_hash):
+        # On macOS, request the static-to-dynamic conversion in the same
+        # invocation (it is ordered after the default target and a no-op
+        # unless the build left a static archive), so one make pass with
+        # one jobserver covers both artifacts
+        targets = ('dynamic',) if sys.platform == 'darwin' else ()
+        print("Building native SBC library...", flush=True)
+        _run_make(*targets, jobs=jobs)
+
+        # Stamp the sources that produced this artifact
+        with open(lib_path + '.stamp', 'w') as f:
+            f.write(src_hash)
+    else:
+        print("SBC library up-to-date, skipping make", flush=True)
+
+    # Ensure target directory exists
+    os.makedirs(os.path.join('python', 'sbc'), exist_ok=True)
+
+    # Copy the library if it is newer than the packaged copy
+    try:
+        lib_mtime = os.stat(lib_path).st_mtime_ns
+    except FileNotFoundError:
+        # A silent warning here used to produce a wheel that only fails
+        # at import time; make the broken build loud and immediate
+        print("Available files in bin directory:")
+        try:
+            print('\n'.join(sorted(os.listdir('bin'))))
+        except FileNotFoundError:
+            print("bin directory does not exist")
+        raise FileNotFoundError(
+            f"libsbc build produced no artifact at {lib_path}")
+
+    dest_path = os.path.join('python', 'sbc', os.path.basename(lib_path))
+    try:
+        dest_mtime = os.stat(dest_path).st_mtime_ns
+    except OSError:
+        dest_mtime = 0
+    if lib_mtime > dest_mtime:
+        print(f"Copying {lib_path} to {dest_path}")
+        shutil.copy2(lib_path, dest_path)
+
+    _native_built = True
+
+
+def _parallel_option(cmd):
+    """
+    Job count from setuptools' own -j plumbing (build_ext --parallel),
+    so `pip install -C--build-option='build_ext -jN'` also controls the
+    make build of the native library.
+    """
+    parallel = cmd.get_finalized_command('build_ext').parallel
+    return parallel if isinstance(parallel, int) else None
+
+
+class BuildSbcClib(build_clib):
+    """Build the native SBC library during the C-library build step."""
+
+    def run(self):
+        _build_native_library(jobs=_parallel_option(self))
+        build_clib.run(self)
 
 
 class BuildLibraryCommand(build_py):
-    """Build the SBC library before building the Python package."""
-    
+    """Ensure the SBC library is built before building the Python package."""
+
     def run(self):
-        # Build the native library
-        print("Building native SBC library...")
-        subprocess.check_call(['make', '-j'])
-        
-        # Copy the library to the package directory
-        lib_path = os.path.join('bin', 'libsbc.so')
-        if sys.platform == 'darwin':
-            lib_path = os.path.join('bin', 'libsbc.dylib')
-            # On macOS, if the file is libsbc.a, we need to build as dynamic library
-            if not os.path.exists(lib_path) and os.path.exists(os.path.join('bin', 'libsbc.a')):
-                print("Converting static library to dynamic library for macOS...")
-                subprocess.check_call(['make', 'dynamic'])
-        elif sys.platform == 'win32':
-            lib_path = os.path.join('bin', 'libsbc.dll')
-        
-        # Ensure target directory exists
-        os.makedirs(os.path.join('python', 'sbc'), exist_ok=True)
-        
-        # Copy library if it exists
-        if os.path.exists(lib_path):
-            dest_path = os.path.join('python', 'sbc', os.path.basename(lib_path))
-            print(f"Copying {lib_path} to {dest_path}")
-            subprocess.check_call(['cp', lib_path, dest_path])
-        else:
-            print(f"Warning: Could not find library at {lib_path}")
-            print("Available files in bin directory:")
-            if os.path.exists('bin'):
-                print(subprocess.check_output(['ls', '-la', 'bin']).decode())
-            else:
-                print("bin directory does not exist")
-        
+        _build_native_library(jobs=_parallel_option(self))
+
         # Continue with normal build_py
         build_py.run(self)
 
 
+class BinaryDistribution(Distribution):
+    """
+    Mark the distribution as carrying native code. The package data
+    (declared in pyproject.toml) embeds the make-built shared library,
+    so wheels must get a platform tag — not py3-none-any — for
+    downstream installs to reuse the binary instead of rebuilding.
+    """
+
+    def has_ext_modules(self):
+        return True
+
+
 # Run the standard setup function
 setup(
+    distclass=BinaryDistribution,
+    zip_safe=False,
     cmdclass={
+        'build_clib': BuildSbcClib,
         'build_py': BuildLibraryCommand,
     }
-) 
\ No newline at end of file
+)
\ No newline at end of file
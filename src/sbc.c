@@ -1561,3 +1561,37 @@ int sbc_encode(struct sbc *sbc,
 
     return 0;
 }
+
+/**
+ * Encode a sequence of frames
+ */
+int sbc_encode_batch(struct sbc *sbc,
+    const int16_t *pcm, int pitch, unsigned nframes,
+    const struct sbc_frame *frame, void *data, unsigned size)
+{
+    /* --- Resolve the frame geometry once for the whole batch --- */
+
+    unsigned frame_size = sbc_get_frame_size(frame);
+    unsigned frame_samples = frame->msbc ? SBC_MSBC_SAMPLES :
+        (unsigned)(frame->nblocks * frame->nsubbands);
+    uint8_t *out = data;
+
+    if (!frame_size)
+        return -1;
+
+    /* --- Encode each frame in place --- */
+
+    for (unsigned i = 0; i < nframes; i++) {
+        const int16_t *pcml = pcm + (size_t)i * frame_samples * (unsigned)pitch;
+        const int16_t *pcmr = pitch > 1 ? pcml + 1 : NULL;
+
+        if (sbc_encode(sbc, pcml, pitch, pcmr, pitch > 1 ? pitch : 0,
+                frame, out, size) < 0)
+            return -1;
+
+        out += frame_size;
+        size -= frame_size;
+    }
+
+    return 0;
+}